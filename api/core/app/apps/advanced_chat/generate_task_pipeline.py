@@ -1,6 +1,7 @@
 import json
 import logging
 import time
+from collections import deque
 from collections.abc import Generator
 from typing import Any, Optional, Union, cast
 
@@ -49,7 +50,7 @@ from core.model_runtime.utils.encoders import jsonable_encoder
 from core.ops.ops_trace_manager import TraceQueueManager
 from core.workflow.entities.node_entities import NodeType, SystemVariable
 from core.workflow.nodes.answer.answer_node import AnswerNode
-from core.workflow.nodes.answer.entities import TextGenerateRouteChunk, VarGenerateRouteChunk
+from core.workflow.nodes.answer.entities import VarGenerateRouteChunk
 from events.message_event import message_was_created
 from extensions.ext_database import db
 from models.account import Account
@@ -114,8 +115,11 @@ class AdvancedChatAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCyc
             usage=LLMUsage.empty_usage()
         )
 
-        self._iteration_nested_relations = self._get_iteration_nested_relations(self._workflow.graph_dict)
-        self._stream_generate_routes = self._get_stream_generate_routes()
+        # graph_dict parses the stored JSON on every access, snapshot it once
+        graph = self._workflow.graph_dict
+        self._iteration_nested_relations = self._get_iteration_nested_relations(graph)
+        self._stream_generate_routes = self._get_stream_generate_routes(graph)
+        self._stream_out_support_cache: dict[tuple, bool] = {}
         self._conversation_name_generate_thread = None
 
     def process(self):
@@ -176,11 +180,16 @@ class AdvancedChatAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCyc
         To stream response.
         :return:
         """
+        # these are fixed for the whole stream, resolve them once instead of per response
+        conversation_id = self._conversation.id
+        message_id = self._message.id
+        created_at = int(self._message.created_at.timestamp())
+
         for stream_response in generator:
             yield ChatbotAppStreamResponse(
-                conversation_id=self._conversation.id,
-                message_id=self._message.id,
-                created_at=int(self._message.created_at.timestamp()),
+                conversation_id=conversation_id,
+                message_id=message_id,
+                created_at=created_at,
                 stream_response=stream_response
             )
 
@@ -203,6 +212,13 @@ class AdvancedChatAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCyc
         if features_dict.get('text_to_speech') and features_dict['text_to_speech'].get('enabled') and features_dict[
                 'text_to_speech'].get('autoPlay') == 'enabled':
             publisher = AppGeneratorTTSPublisher(tenant_id, features_dict['text_to_speech'].get('voice'))
+
+        if not publisher:
+            # no TTS publisher, skip the per-response audio polling entirely
+            yield from self._process_stream_response(publisher=publisher, trace_manager=trace_manager)
+            yield MessageAudioEndStreamResponse(audio='', task_id=task_id)
+            return
+
         for response in self._process_stream_response(publisher=publisher, trace_manager=trace_manager):
             while True:
                 audio_response = self._listenAudioMsg(publisher, task_id=task_id)
@@ -243,12 +259,34 @@ class AdvancedChatAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCyc
         Process stream response.
         :return:
         """
+        # prebind per-event lookups, the listen loop runs once per queued event
+        task_id = self._application_generate_entity.task_id
+        publish_audio = publisher.publish if publisher else None
+
         for message in self._queue_manager.listen():
-            if publisher:
-                publisher.publish(message=message)
+            if publish_audio:
+                publish_audio(message=message)
             event = message.event
 
-            if isinstance(event, QueueErrorEvent):
+            if isinstance(event, QueueTextChunkEvent):
+                # checked first, chunk events dominate the queue during generation
+                delta_text = event.text
+                if delta_text is None:
+                    continue
+
+                if not self._is_stream_out_support(
+                        event=event
+                ):
+                    continue
+
+                # handle output moderation chunk
+                should_direct_answer = self._handle_output_moderation_chunk(delta_text)
+                if should_direct_answer:
+                    continue
+
+                self._task_state.answer += delta_text
+                yield self._message_to_stream_response(delta_text, self._message.id)
+            elif isinstance(event, QueueErrorEvent):
                 err = self._handle_error(event, self._message)
                 yield self._error_to_stream_response(err)
                 break
@@ -263,7 +301,7 @@ class AdvancedChatAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCyc
                 db.session.close()
 
                 yield self._workflow_start_to_stream_response(
-                    task_id=self._application_generate_entity.task_id,
+                    task_id=task_id,
                     workflow_run=workflow_run
                 )
             elif isinstance(event, QueueNodeStartedEvent):
@@ -280,25 +318,24 @@ class AdvancedChatAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCyc
 
                 yield self._workflow_node_start_to_stream_response(
                     event=event,
-                    task_id=self._application_generate_entity.task_id,
+                    task_id=task_id,
                     workflow_node_execution=workflow_node_execution
                 )
             elif isinstance(event, QueueNodeSucceededEvent | QueueNodeFailedEvent):
                 workflow_node_execution = self._handle_node_finished(event)
 
-                # stream outputs when node finished
-                generator = self._generate_stream_outputs_when_node_finished()
-                if generator:
-                    yield from generator
+                # stream outputs when node finished, skip when no stream route is active
+                if self._task_state.current_stream_generate_state:
+                    yield from self._generate_stream_outputs_when_node_finished()
 
                 yield self._workflow_node_finish_to_stream_response(
-                    task_id=self._application_generate_entity.task_id,
+                    task_id=task_id,
                     workflow_node_execution=workflow_node_execution
                 )
 
                 if isinstance(event, QueueNodeFailedEvent):
                     yield from self._handle_iteration_exception(
-                        task_id=self._application_generate_entity.task_id,
+                        task_id=task_id,
                         error=f'Child node failed: {event.error}'
                     )
             elif isinstance(event, QueueIterationStartEvent | QueueIterationNextEvent | QueueIterationCompletedEvent):
@@ -309,7 +346,7 @@ class AdvancedChatAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCyc
                         for node_id in iteration_relations:
                             self._task_state.ran_node_execution_infos.pop(node_id, None)
 
-                yield self._handle_iteration_to_stream_response(self._application_generate_entity.task_id, event)
+                yield self._handle_iteration_to_stream_response(task_id, event)
                 self._handle_iteration_operation(event)
             elif isinstance(event, QueueStopEvent | QueueWorkflowSucceededEvent | QueueWorkflowFailedEvent):
                 workflow_run = self._handle_workflow_finished(
@@ -317,7 +354,7 @@ class AdvancedChatAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCyc
                 )
                 if workflow_run:
                     yield self._workflow_finish_to_stream_response(
-                        task_id=self._application_generate_entity.task_id,
+                        task_id=task_id,
                         workflow_run=workflow_run
                     )
 
@@ -351,23 +388,6 @@ class AdvancedChatAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCyc
                 self._handle_retriever_resources(event)
             elif isinstance(event, QueueAnnotationReplyEvent):
                 self._handle_annotation_reply(event)
-            elif isinstance(event, QueueTextChunkEvent):
-                delta_text = event.text
-                if delta_text is None:
-                    continue
-
-                if not self._is_stream_out_support(
-                        event=event
-                ):
-                    continue
-
-                # handle output moderation chunk
-                should_direct_answer = self._handle_output_moderation_chunk(delta_text)
-                if should_direct_answer:
-                    continue
-
-                self._task_state.answer += delta_text
-                yield self._message_to_stream_response(delta_text, self._message.id)
             elif isinstance(event, QueueMessageReplaceEvent):
                 yield self._message_replace_to_stream_response(answer=event.text)
             elif isinstance(event, QueuePingEvent):
@@ -428,25 +448,36 @@ class AdvancedChatAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCyc
             **extras
         )
 
-    def _get_stream_generate_routes(self) -> dict[str, ChatflowStreamGenerateRoute]:
+    def _get_stream_generate_routes(self, graph: dict) -> dict[str, ChatflowStreamGenerateRoute]:
         """
         Get stream generate routes.
+        :param graph: graph
         :return:
         """
         # find all answer nodes
-        graph = self._workflow.graph_dict
         answer_node_configs = [
             node for node in graph['nodes']
             if node.get('data', {}).get('type') == NodeType.ANSWER.value
         ]
 
+        # build graph indexes once, shared by all answer node walks
+        node_config_by_id = {node.get('id'): node for node in graph['nodes']}
+        ingoing_edges_by_target: dict[str, list[dict]] = {}
+        for edge in graph['edges']:
+            ingoing_edges_by_target.setdefault(edge.get('target'), []).append(edge)
+
         # parse stream output node value selectors of answer nodes
         stream_generate_routes = {}
+        start_at_node_ids_memo: dict[str, list[str]] = {}
         for node_config in answer_node_configs:
             # get generate route for stream output
             answer_node_id = node_config['id']
             generate_route = AnswerNode.extract_generate_route_selectors(node_config)
-            start_node_ids = self._get_answer_start_at_node_ids(graph, answer_node_id)
+            start_node_ids = self._get_answer_start_at_node_ids(
+                graph, answer_node_id, start_at_node_ids_memo,
+                node_config_by_id=node_config_by_id,
+                ingoing_edges_by_target=ingoing_edges_by_target
+            )
             if not start_node_ids:
                 continue
 
@@ -458,146 +489,147 @@ class AdvancedChatAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCyc
 
         return stream_generate_routes
 
-    def _get_answer_start_at_node_ids(self, graph: dict, target_node_id: str) \
+    def _get_answer_start_at_node_ids(self, graph: dict, target_node_id: str,
+                                      memo: Optional[dict[str, list[str]]] = None,
+                                      node_config_by_id: Optional[dict[str, dict]] = None,
+                                      ingoing_edges_by_target: Optional[dict[str, list[dict]]] = None) \
             -> list[str]:
         """
         Get answer start at node id.
         :param graph: graph
         :param target_node_id: target node ID
+        :param memo: memo of target node id to start node ids, shared across calls
+        :param node_config_by_id: node id to node config index, built from graph if not provided
+        :param ingoing_edges_by_target: target node id to ingoing edges index, built from graph if not provided
         :return:
         """
-        nodes = graph.get('nodes')
-        edges = graph.get('edges')
+        if memo is None:
+            memo = {}
 
-        # fetch all ingoing edges from source node
-        ingoing_edges = []
-        for edge in edges:
-            if edge.get('target') == target_node_id:
-                ingoing_edges.append(edge)
+        if target_node_id in memo:
+            return memo[target_node_id]
 
-        if not ingoing_edges:
-            # check if it's the first node in the iteration
-            target_node = next((node for node in nodes if node.get('id') == target_node_id), None)
-            if not target_node:
-                return []
+        nodes = graph.get('nodes')
 
-            node_iteration_id = target_node.get('data', {}).get('iteration_id')
-            # get iteration start node id
-            for node in nodes:
-                if node.get('id') == node_iteration_id:
-                    if node.get('data', {}).get('start_node_id') == target_node_id:
-                        return [target_node_id]
+        if node_config_by_id is None:
+            node_config_by_id = {node.get('id'): node for node in nodes}
 
-            return []
+        if ingoing_edges_by_target is None:
+            ingoing_edges_by_target = {}
+            for edge in graph.get('edges'):
+                ingoing_edges_by_target.setdefault(edge.get('target'), []).append(edge)
 
+        # walk ingoing edges iteratively, visited set avoids re-expanding shared upstream nodes
         start_node_ids = []
-        for ingoing_edge in ingoing_edges:
-            source_node_id = ingoing_edge.get('source')
-            source_node = next((node for node in nodes if node.get('id') == source_node_id), None)
-            if not source_node:
+        queue = deque([target_node_id])
+        visited = {target_node_id}
+        while queue:
+            current_node_id = queue.popleft()
+
+            if current_node_id != target_node_id and current_node_id in memo:
+                start_node_ids.extend(memo[current_node_id])
                 continue
 
-            node_type = source_node.get('data', {}).get('type')
-            node_iteration_id = source_node.get('data', {}).get('iteration_id')
-            iteration_start_node_id = None
-            if node_iteration_id:
-                iteration_node = next((node for node in nodes if node.get('id') == node_iteration_id), None)
-                iteration_start_node_id = iteration_node.get('data', {}).get('start_node_id')
-
-            if node_type in [
-                NodeType.ANSWER.value,
-                NodeType.IF_ELSE.value,
-                NodeType.QUESTION_CLASSIFIER.value,
-                NodeType.ITERATION.value,
-                NodeType.LOOP.value
-            ]:
-                start_node_id = target_node_id
-                start_node_ids.append(start_node_id)
-            elif node_type == NodeType.START.value or \
-                    node_iteration_id is not None and iteration_start_node_id == source_node.get('id'):
-                start_node_id = source_node_id
-                start_node_ids.append(start_node_id)
-            else:
-                sub_start_node_ids = self._get_answer_start_at_node_ids(graph, source_node_id)
-                if sub_start_node_ids:
-                    start_node_ids.extend(sub_start_node_ids)
+            # fetch all ingoing edges from current node
+            ingoing_edges = ingoing_edges_by_target.get(current_node_id)
 
-        return start_node_ids
+            if not ingoing_edges:
+                # check if it's the first node in the iteration
+                current_node = node_config_by_id.get(current_node_id)
+                if not current_node:
+                    continue
 
-    def _get_iteration_nested_relations(self, graph: dict) -> dict[str, list[str]]:
-        """
-        Get iteration nested relations.
-        :param graph: graph
-        :return:
-        """
-        nodes = graph.get('nodes')
+                node_iteration_id = current_node.get('data', {}).get('iteration_id')
+                # get iteration start node id
+                iteration_node = node_config_by_id.get(node_iteration_id)
+                if iteration_node and iteration_node.get('data', {}).get('start_node_id') == current_node_id:
+                    start_node_ids.append(current_node_id)
 
-        iteration_ids = [node.get('id') for node in nodes
-                         if node.get('data', {}).get('type') in [
-                             NodeType.ITERATION.value,
-                             NodeType.LOOP.value,
-                         ]]
+                continue
 
-        return {
-            iteration_id: [
-                node.get('id') for node in nodes if node.get('data', {}).get('iteration_id') == iteration_id
-            ] for iteration_id in iteration_ids
-        }
+            for ingoing_edge in ingoing_edges:
+                source_node_id = ingoing_edge.get('source')
+                source_node = node_config_by_id.get(source_node_id)
+                if not source_node:
+                    continue
+
+                node_type = source_node.get('data', {}).get('type')
+                node_iteration_id = source_node.get('data', {}).get('iteration_id')
+                iteration_start_node_id = None
+                if node_iteration_id:
+                    iteration_node = node_config_by_id.get(node_iteration_id)
+                    iteration_start_node_id = iteration_node.get('data', {}).get('start_node_id')
+
+                if node_type in [
+                    NodeType.ANSWER.value,
+                    NodeType.IF_ELSE.value,
+                    NodeType.QUESTION_CLASSIFIER.value,
+                    NodeType.ITERATION.value,
+                    NodeType.LOOP.value
+                ]:
+                    start_node_ids.append(current_node_id)
+                elif node_type == NodeType.START.value or \
+                        node_iteration_id is not None and iteration_start_node_id == source_node.get('id'):
+                    start_node_ids.append(source_node_id)
+                elif source_node_id not in visited:
+                    visited.add(source_node_id)
+                    queue.append(source_node_id)
+
+        memo[target_node_id] = start_node_ids
+        return start_node_ids
 
     def _generate_stream_outputs_when_node_started(self) -> Generator:
         """
         Generate stream outputs.
         :return:
         """
-        if self._task_state.current_stream_generate_state:
-            route_chunks = self._task_state.current_stream_generate_state.generate_route[
-                           self._task_state.current_stream_generate_state.current_route_position:
-                           ]
+        state = self._task_state.current_stream_generate_state
+        if state:
+            task_state = self._task_state
+            message_id = self._message.id
+            route_chunks = state.generate_route[state.current_route_position:]
 
             for route_chunk in route_chunks:
                 if route_chunk.type == 'text':
-                    route_chunk = cast(TextGenerateRouteChunk, route_chunk)
-
                     # handle output moderation chunk
                     should_direct_answer = self._handle_output_moderation_chunk(route_chunk.text)
                     if should_direct_answer:
                         continue
 
-                    self._task_state.answer += route_chunk.text
-                    yield self._message_to_stream_response(route_chunk.text, self._message.id)
+                    task_state.answer += route_chunk.text
+                    yield self._message_to_stream_response(route_chunk.text, message_id)
                 else:
                     break
 
-                self._task_state.current_stream_generate_state.current_route_position += 1
+                state.current_route_position += 1
 
             # all route chunks are generated
-            if self._task_state.current_stream_generate_state.current_route_position == len(
-                    self._task_state.current_stream_generate_state.generate_route
-            ):
-                self._task_state.current_stream_generate_state = None
+            if state.current_route_position == len(state.generate_route):
+                task_state.current_stream_generate_state = None
 
     def _generate_stream_outputs_when_node_finished(self) -> Optional[Generator]:
         """
         Generate stream outputs.
         :return:
         """
-        if not self._task_state.current_stream_generate_state:
+        state = self._task_state.current_stream_generate_state
+        if not state:
             return
 
-        route_chunks = self._task_state.current_stream_generate_state.generate_route[
-                       self._task_state.current_stream_generate_state.current_route_position:]
+        task_state = self._task_state
+        message_id = self._message.id
+        ran_node_execution_infos = task_state.ran_node_execution_infos
+        route_chunks = state.generate_route[state.current_route_position:]
 
         for route_chunk in route_chunks:
             if route_chunk.type == 'text':
-                route_chunk = cast(TextGenerateRouteChunk, route_chunk)
-                self._task_state.answer += route_chunk.text
-                yield self._message_to_stream_response(route_chunk.text, self._message.id)
+                task_state.answer += route_chunk.text
+                yield self._message_to_stream_response(route_chunk.text, message_id)
             else:
                 value = None
-                route_chunk = cast(VarGenerateRouteChunk, route_chunk)
                 value_selector = route_chunk.value_selector
                 if not value_selector:
-                    self._task_state.current_stream_generate_state.current_route_position += 1
+                    state.current_route_position += 1
                     continue
 
                 route_chunk_node_id = value_selector[0]
@@ -622,17 +654,17 @@ class AdvancedChatAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCyc
                         ) else None
                 else:
                     # check chunk node id is before current node id or equal to current node id
-                    if route_chunk_node_id not in self._task_state.ran_node_execution_infos:
+                    if route_chunk_node_id not in ran_node_execution_infos:
                         break
 
-                    latest_node_execution_info = self._task_state.latest_node_execution_info
+                    latest_node_execution_info = task_state.latest_node_execution_info
 
                     # get route chunk node execution info
-                    route_chunk_node_execution_info = self._task_state.ran_node_execution_infos[route_chunk_node_id]
+                    route_chunk_node_execution_info = ran_node_execution_infos[route_chunk_node_id]
                     if (route_chunk_node_execution_info.node_type == NodeType.LLM
                             and latest_node_execution_info.node_type == NodeType.LLM):
                         # only LLM support chunk stream output
-                        self._task_state.current_stream_generate_state.current_route_position += 1
+                        state.current_route_position += 1
                         continue
 
                     # get route chunk node execution
@@ -693,16 +725,14 @@ class AdvancedChatAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCyc
                             text = json.dumps(value, ensure_ascii=False)
 
                     if text:
-                        self._task_state.answer += text
-                        yield self._message_to_stream_response(text, self._message.id)
+                        task_state.answer += text
+                        yield self._message_to_stream_response(text, message_id)
 
-            self._task_state.current_stream_generate_state.current_route_position += 1
+            state.current_route_position += 1
 
         # all route chunks are generated
-        if self._task_state.current_stream_generate_state.current_route_position == len(
-                self._task_state.current_stream_generate_state.generate_route
-        ):
-            self._task_state.current_stream_generate_state = None
+        if state.current_route_position == len(state.generate_route):
+            task_state.current_stream_generate_state = None
 
     def _is_stream_out_support(self, event: QueueTextChunkEvent) -> bool:
         """
@@ -716,32 +746,42 @@ class AdvancedChatAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCyc
         if 'node_id' not in event.metadata:
             return True
 
+        # bail out before the metadata lookups when no stream route is active
+        state = self._task_state.current_stream_generate_state
+        if not state:
+            return False
+
         node_type = event.metadata.get('node_type')
         stream_output_value_selector = event.metadata.get('value_selector')
         if not stream_output_value_selector:
             return False
 
-        if not self._task_state.current_stream_generate_state:
-            return False
+        # consecutive chunks from the same upstream node repeat the identical check, cache the verdict
+        cache_key = (
+            state.answer_node_id,
+            state.current_route_position,
+            node_type,
+            tuple(stream_output_value_selector)
+        )
+        cached_result = self._stream_out_support_cache.get(cache_key)
+        if cached_result is not None:
+            return cached_result
 
-        route_chunk = self._task_state.current_stream_generate_state.generate_route[
-            self._task_state.current_stream_generate_state.current_route_position]
+        route_chunk = state.generate_route[state.current_route_position]
 
         if route_chunk.type != 'var':
-            return False
-
-        if node_type != NodeType.LLM:
+            result = False
+        elif node_type != NodeType.LLM:
             # only LLM support chunk stream output
-            return False
-
-        route_chunk = cast(VarGenerateRouteChunk, route_chunk)
-        value_selector = route_chunk.value_selector
+            result = False
+        else:
+            route_chunk = cast(VarGenerateRouteChunk, route_chunk)
 
-        # check chunk node id is before current node id or equal to current node id
-        if value_selector != stream_output_value_selector:
-            return False
+            # check chunk node id is before current node id or equal to current node id
+            result = route_chunk.value_selector == stream_output_value_selector
 
-        return True
+        self._stream_out_support_cache[cache_key] = result
+        return result
 
     def _handle_output_moderation_chunk(self, text: str) -> bool:
         """
@@ -1,5 +1,6 @@
 import logging
 import time
+from collections import deque
 from collections.abc import Generator
 from typing import Any, Optional, Union
 
@@ -98,8 +99,10 @@ class WorkflowAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCycleMa
         self._task_state = WorkflowTaskState(
             iteration_nested_node_ids=[]
         )
-        self._stream_generate_nodes = self._get_stream_generate_nodes()
-        self._iteration_nested_relations = self._get_iteration_nested_relations(self._workflow.graph_dict)
+        # graph_dict parses the stored JSON on every access, snapshot it once
+        graph = self._workflow.graph_dict
+        self._stream_generate_nodes = self._get_stream_generate_nodes(graph)
+        self._iteration_nested_relations = self._get_iteration_nested_relations(graph)
 
     def process(self) -> Union[WorkflowAppBlockingResponse, Generator[WorkflowAppStreamResponse, None, None]]:
         """
@@ -185,6 +188,13 @@ class WorkflowAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCycleMa
         if features_dict.get('text_to_speech') and features_dict['text_to_speech'].get('enabled') and features_dict[
                 'text_to_speech'].get('autoPlay') == 'enabled':
             publisher = AppGeneratorTTSPublisher(tenant_id, features_dict['text_to_speech'].get('voice'))
+
+        if not publisher:
+            # no TTS publisher, skip the per-response audio polling entirely
+            yield from self._process_stream_response(publisher=publisher, trace_manager=trace_manager)
+            yield MessageAudioEndStreamResponse(audio='', task_id=task_id)
+            return
+
         for response in self._process_stream_response(publisher=publisher, trace_manager=trace_manager):
             while True:
                 audio_response = self._listenAudioMsg(publisher, task_id=task_id)
@@ -224,19 +234,36 @@ class WorkflowAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCycleMa
         Process stream response.
         :return:
         """
+        # prebind per-event lookups, the listen loop runs once per queued event
+        task_id = self._application_generate_entity.task_id
+        publish_audio = publisher.publish if publisher else None
+
         for message in self._queue_manager.listen():
-            if publisher:
-                publisher.publish(message=message)
+            if publish_audio:
+                publish_audio(message=message)
             event = message.event
 
-            if isinstance(event, QueueErrorEvent):
+            if isinstance(event, QueueTextChunkEvent):
+                # checked first, chunk events dominate the queue during generation
+                delta_text = event.text
+                if delta_text is None:
+                    continue
+
+                if not self._is_stream_out_support(
+                        event=event
+                ):
+                    continue
+
+                self._task_state.answer += delta_text
+                yield self._text_chunk_to_stream_response(delta_text)
+            elif isinstance(event, QueueErrorEvent):
                 err = self._handle_error(event)
                 yield self._error_to_stream_response(err)
                 break
             elif isinstance(event, QueueWorkflowStartedEvent):
                 workflow_run = self._handle_workflow_start()
                 yield self._workflow_start_to_stream_response(
-                    task_id=self._application_generate_entity.task_id,
+                    task_id=task_id,
                     workflow_run=workflow_run
                 )
             elif isinstance(event, QueueNodeStartedEvent):
@@ -251,20 +278,20 @@ class WorkflowAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCycleMa
 
                 yield self._workflow_node_start_to_stream_response(
                     event=event,
-                    task_id=self._application_generate_entity.task_id,
+                    task_id=task_id,
                     workflow_node_execution=workflow_node_execution
                 )
             elif isinstance(event, QueueNodeSucceededEvent | QueueNodeFailedEvent):
                 workflow_node_execution = self._handle_node_finished(event)
 
                 yield self._workflow_node_finish_to_stream_response(
-                    task_id=self._application_generate_entity.task_id,
+                    task_id=task_id,
                     workflow_node_execution=workflow_node_execution
                 )
 
                 if isinstance(event, QueueNodeFailedEvent):
                     yield from self._handle_iteration_exception(
-                        task_id=self._application_generate_entity.task_id,
+                        task_id=task_id,
                         error=f'Child node failed: {event.error}'
                     )
             elif isinstance(event, QueueIterationStartEvent | QueueIterationNextEvent | QueueIterationCompletedEvent):
@@ -275,7 +302,7 @@ class WorkflowAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCycleMa
                         for node_id in iteration_relations:
                             self._task_state.ran_node_execution_infos.pop(node_id, None)
 
-                yield self._handle_iteration_to_stream_response(self._application_generate_entity.task_id, event)
+                yield self._handle_iteration_to_stream_response(task_id, event)
                 self._handle_iteration_operation(event)
             elif isinstance(event, QueueStopEvent | QueueWorkflowSucceededEvent | QueueWorkflowFailedEvent):
                 workflow_run = self._handle_workflow_finished(
@@ -286,21 +313,9 @@ class WorkflowAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCycleMa
                 self._save_workflow_app_log(workflow_run)
 
                 yield self._workflow_finish_to_stream_response(
-                    task_id=self._application_generate_entity.task_id,
+                    task_id=task_id,
                     workflow_run=workflow_run
                 )
-            elif isinstance(event, QueueTextChunkEvent):
-                delta_text = event.text
-                if delta_text is None:
-                    continue
-
-                if not self._is_stream_out_support(
-                        event=event
-                ):
-                    continue
-
-                self._task_state.answer += delta_text
-                yield self._text_chunk_to_stream_response(delta_text)
             elif isinstance(event, QueueMessageReplaceEvent):
                 yield self._text_replace_to_stream_response(event.text)
             elif isinstance(event, QueuePingEvent):
@@ -347,9 +362,11 @@ class WorkflowAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCycleMa
         :param text: text
         :return:
         """
-        response = TextChunkStreamResponse(
+        # built once per streamed chunk, so skip pydantic validation of
+        # fields that are already known to be valid
+        response = TextChunkStreamResponse.model_construct(
             task_id=self._application_generate_entity.task_id,
-            data=TextChunkStreamResponse.Data(text=text)
+            data=TextChunkStreamResponse.Data.model_construct(text=text)
         )
 
         return response
@@ -365,25 +382,36 @@ class WorkflowAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCycleMa
             text=TextReplaceStreamResponse.Data(text=text)
         )
 
-    def _get_stream_generate_nodes(self) -> dict[str, WorkflowStreamGenerateNodes]:
+    def _get_stream_generate_nodes(self, graph: dict) -> dict[str, WorkflowStreamGenerateNodes]:
         """
         Get stream generate nodes.
+        :param graph: graph
         :return:
         """
         # find all answer nodes
-        graph = self._workflow.graph_dict
         end_node_configs = [
             node for node in graph['nodes']
             if node.get('data', {}).get('type') == NodeType.END.value
         ]
 
+        # build graph indexes once, shared by all end node walks
+        node_config_by_id = {node.get('id'): node for node in graph['nodes']}
+        ingoing_edges_by_target: dict[str, list[dict]] = {}
+        for edge in graph['edges']:
+            ingoing_edges_by_target.setdefault(edge.get('target'), []).append(edge)
+
         # parse stream output node value selectors of end nodes
         stream_generate_routes = {}
+        start_at_node_ids_memo: dict[str, list[str]] = {}
         for node_config in end_node_configs:
             # get generate route for stream output
             end_node_id = node_config['id']
             generate_nodes = EndNode.extract_generate_nodes(graph, node_config)
-            start_node_ids = self._get_end_start_at_node_ids(graph, end_node_id)
+            start_node_ids = self._get_end_start_at_node_ids(
+                graph, end_node_id, start_at_node_ids_memo,
+                node_config_by_id=node_config_by_id,
+                ingoing_edges_by_target=ingoing_edges_by_target
+            )
             if not start_node_ids:
                 continue
 
@@ -395,55 +423,74 @@ class WorkflowAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCycleMa
 
         return stream_generate_routes
 
-    def _get_end_start_at_node_ids(self, graph: dict, target_node_id: str) \
+    def _get_end_start_at_node_ids(self, graph: dict, target_node_id: str,
+                                   memo: Optional[dict[str, list[str]]] = None,
+                                   node_config_by_id: Optional[dict[str, dict]] = None,
+                                   ingoing_edges_by_target: Optional[dict[str, list[dict]]] = None) \
             -> list[str]:
         """
         Get end start at node id.
         :param graph: graph
         :param target_node_id: target node ID
+        :param memo: memo of target node id to start node ids, shared across calls
+        :param node_config_by_id: node id to node config index, built from graph if not provided
+        :param ingoing_edges_by_target: target node id to ingoing edges index, built from graph if not provided
         :return:
         """
-        nodes = graph.get('nodes')
-        edges = graph.get('edges')
+        if memo is None:
+            memo = {}
+
+        if target_node_id in memo:
+            return memo[target_node_id]
 
-        # fetch all ingoing edges from source node
-        ingoing_edges = []
-        for edge in edges:
-            if edge.get('target') == target_node_id:
-                ingoing_edges.append(edge)
+        if node_config_by_id is None:
+            node_config_by_id = {node.get('id'): node for node in graph.get('nodes')}
 
-        if not ingoing_edges:
-            return []
+        if ingoing_edges_by_target is None:
+            ingoing_edges_by_target = {}
+            for edge in graph.get('edges'):
+                ingoing_edges_by_target.setdefault(edge.get('target'), []).append(edge)
 
+        # walk ingoing edges iteratively, visited set avoids re-expanding shared upstream nodes
         start_node_ids = []
-        for ingoing_edge in ingoing_edges:
-            source_node_id = ingoing_edge.get('source')
-            source_node = next((node for node in nodes if node.get('id') == source_node_id), None)
-            if not source_node:
+        queue = deque([target_node_id])
+        visited = {target_node_id}
+        while queue:
+            current_node_id = queue.popleft()
+
+            if current_node_id != target_node_id and current_node_id in memo:
+                start_node_ids.extend(memo[current_node_id])
                 continue
 
-            node_type = source_node.get('data', {}).get('type')
-            node_iteration_id = source_node.get('data', {}).get('iteration_id')
-            iteration_start_node_id = None
-            if node_iteration_id:
-                iteration_node = next((node for node in nodes if node.get('id') == node_iteration_id), None)
-                iteration_start_node_id = iteration_node.get('data', {}).get('start_node_id')
-
-            if node_type in [
-                NodeType.IF_ELSE.value,
-                NodeType.QUESTION_CLASSIFIER.value
-            ]:
-                start_node_id = target_node_id
-                start_node_ids.append(start_node_id)
-            elif node_type == NodeType.START.value or \
-                node_iteration_id is not None and iteration_start_node_id == source_node.get('id'):
-                start_node_id = source_node_id
-                start_node_ids.append(start_node_id)
-            else:
-                sub_start_node_ids = self._get_end_start_at_node_ids(graph, source_node_id)
-                if sub_start_node_ids:
-                    start_node_ids.extend(sub_start_node_ids)
+            # fetch all ingoing edges from current node
+            ingoing_edges = ingoing_edges_by_target.get(current_node_id, [])
 
+            for ingoing_edge in ingoing_edges:
+                source_node_id = ingoing_edge.get('source')
+                source_node = node_config_by_id.get(source_node_id)
+                if not source_node:
+                    continue
+
+                node_type = source_node.get('data', {}).get('type')
+                node_iteration_id = source_node.get('data', {}).get('iteration_id')
+                iteration_start_node_id = None
+                if node_iteration_id:
+                    iteration_node = node_config_by_id.get(node_iteration_id)
+                    iteration_start_node_id = iteration_node.get('data', {}).get('start_node_id')
+
+                if node_type in [
+                    NodeType.IF_ELSE.value,
+                    NodeType.QUESTION_CLASSIFIER.value
+                ]:
+                    start_node_ids.append(current_node_id)
+                elif node_type == NodeType.START.value or \
+                    node_iteration_id is not None and iteration_start_node_id == source_node.get('id'):
+                    start_node_ids.append(source_node_id)
+                elif source_node_id not in visited:
+                    visited.add(source_node_id)
+                    queue.append(source_node_id)
+
+        memo[target_node_id] = start_node_ids
         return start_node_ids
 
     def _generate_stream_outputs_when_node_started(self) -> Generator:
@@ -454,15 +501,22 @@ class WorkflowAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCycleMa
         if self._task_state.current_stream_generate_state:
             stream_node_ids = self._task_state.current_stream_generate_state.stream_node_ids
 
-            for node_id, node_execution_info in self._task_state.ran_node_execution_infos.items():
-                if node_id not in stream_node_ids:
-                    continue
+            # collect chunk node execution ids, then fetch them in a single query
+            execution_ids = [
+                node_execution_info.workflow_node_execution_id
+                for node_id, node_execution_info in self._task_state.ran_node_execution_infos.items()
+                if node_id in stream_node_ids
+            ]
 
-                node_execution_info = self._task_state.ran_node_execution_infos[node_id]
+            node_execution_by_id = {}
+            if execution_ids:
+                node_executions = db.session.query(WorkflowNodeExecution).filter(
+                    WorkflowNodeExecution.id.in_(execution_ids)).all()
+                node_execution_by_id = {node_execution.id: node_execution for node_execution in node_executions}
 
+            for execution_id in execution_ids:
                 # get chunk node execution
-                route_chunk_node_execution = db.session.query(WorkflowNodeExecution).filter(
-                    WorkflowNodeExecution.id == node_execution_info.workflow_node_execution_id).first()
+                route_chunk_node_execution = node_execution_by_id.get(execution_id)
 
                 if not route_chunk_node_execution:
                     continue
@@ -487,6 +541,11 @@ class WorkflowAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCycleMa
         :param event: queue text chunk event
         :return:
         """
+        # bail out before the metadata lookups when no stream route is active
+        state = self._task_state.current_stream_generate_state
+        if not state:
+            return False
+
         if not event.metadata:
             return False
 
@@ -494,40 +553,16 @@ class WorkflowAppGenerateTaskPipeline(BasedGenerateTaskPipeline, WorkflowCycleMa
             return False
 
         node_id = event.metadata.get('node_id')
+        if node_id not in state.stream_node_ids:
+            return False
+
         node_type = event.metadata.get('node_type')
         stream_output_value_selector = event.metadata.get('value_selector')
         if not stream_output_value_selector:
             return False
 
-        if not self._task_state.current_stream_generate_state:
-            return False
-
-        if node_id not in self._task_state.current_stream_generate_state.stream_node_ids:
-            return False
-
         if node_type != NodeType.LLM:
             # only LLM support chunk stream output
             return False
 
         return True
-
-    def _get_iteration_nested_relations(self, graph: dict) -> dict[str, list[str]]:
-        """
-        Get iteration nested relations.
-        :param graph: graph
-        :return:
-        """
-        nodes = graph.get('nodes')
-
-        iteration_ids = [node.get('id') for node in nodes 
-                         if node.get('data', {}).get('type') in [
-                             NodeType.ITERATION.value,
-                             NodeType.LOOP.value,
-                        ]]
-
-        return {
-            iteration_id: [
-                node.get('id') for node in nodes if node.get('data', {}).get('iteration_id') == iteration_id
-            ] for iteration_id in iteration_ids
-        }
-    
\ No newline at end of file
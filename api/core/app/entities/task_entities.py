@@ -16,7 +16,7 @@ class WorkflowStreamGenerateNodes(BaseModel):
     WorkflowStreamGenerateNodes entity
     """
     end_node_id: str
-    stream_node_ids: list[str]
+    stream_node_ids: set[str]
 
 
 class ChatflowStreamGenerateRoute(BaseModel):
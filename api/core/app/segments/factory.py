@@ -64,9 +64,22 @@ def build_variable_from_mapping(m: Mapping[str, Any], /) -> Variable:
     raise ValueError(f'not supported value type {value_type}')
 
 
+# exact-type dispatch for the common scalar cases, bool stays on the integer path
+_SEGMENT_CLASS_BY_TYPE: Mapping[type, type[Segment]] = {
+    str: StringSegment,
+    int: IntegerSegment,
+    bool: IntegerSegment,
+    float: FloatSegment,
+    FileVar: FileSegment,
+}
+
+
 def build_segment(value: Any, /) -> Segment:
     if value is None:
         return NoneSegment()
+    segment_class = _SEGMENT_CLASS_BY_TYPE.get(type(value))
+    if segment_class is not None:
+        return segment_class(value=value)
     if isinstance(value, str):
         return StringSegment(value=value)
     if isinstance(value, int):
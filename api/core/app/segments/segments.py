@@ -1,5 +1,6 @@
 import json
 from collections.abc import Mapping, Sequence
+from functools import cached_property
 from typing import Any
 
 from pydantic import BaseModel, ConfigDict, field_validator
@@ -97,9 +98,10 @@ class ObjectSegment(Segment):
         # TODO: Process variables.
         return json.dumps(self.model_dump()['value'], ensure_ascii=False, indent=2)
 
-    @property
+    @cached_property
     def markdown(self) -> str:
         # TODO: Use markdown code block
+        # cached, segments are frozen so the rendered value never changes
         return json.dumps(self.model_dump()['value'], ensure_ascii=False, indent=2)
 
     def to_object(self):
@@ -107,8 +109,9 @@ class ObjectSegment(Segment):
 
 
 class ArraySegment(Segment):
-    @property
+    @cached_property
     def markdown(self) -> str:
+        # cached, segments are frozen so the rendered value never changes
         return '\n'.join(['- ' + item.markdown for item in self.value])
 
     def to_object(self):
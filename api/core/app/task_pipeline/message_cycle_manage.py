@@ -190,7 +190,9 @@ class MessageCycleManage:
         :param message_id: message id
         :return:
         """
-        return MessageStreamResponse(
+        # built once per streamed chunk, so skip pydantic validation of
+        # fields that are already known to be valid strings
+        return MessageStreamResponse.model_construct(
             task_id=self._application_generate_entity.task_id,
             id=message_id,
             answer=answer
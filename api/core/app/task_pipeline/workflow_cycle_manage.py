@@ -650,3 +650,27 @@ class WorkflowCycleManage(WorkflowIterationCycleManage):
             return value.to_dict()
 
         return None
+
+    def _get_iteration_nested_relations(self, graph: dict) -> dict[str, list[str]]:
+        """
+        Get iteration nested relations.
+        :param graph: graph
+        :return:
+        """
+        nodes = graph.get('nodes')
+
+        # single pass over nodes instead of one scan per iteration node
+        relations: dict[str, list[str]] = {
+            node.get('id'): [] for node in nodes
+            if node.get('data', {}).get('type') in [
+                NodeType.ITERATION.value,
+                NodeType.LOOP.value,
+            ]
+        }
+
+        for node in nodes:
+            iteration_id = node.get('data', {}).get('iteration_id')
+            if iteration_id in relations:
+                relations[iteration_id].append(node.get('id'))
+
+        return relations
@@ -34,13 +34,11 @@ class AnswerNode(BaseNode):
         answer = ''
         for part in generate_routes:
             if part.type == "var":
-                part = cast(VarGenerateRouteChunk, part)
                 value_selector = part.value_selector
                 value = variable_pool.get(value_selector)
                 if value:
                     answer += value.markdown
             else:
-                part = cast(TextGenerateRouteChunk, part)
                 answer += part.text
 
         return NodeRunResult(
@@ -77,14 +75,13 @@ class AnswerNode(BaseNode):
             for variable_selector in variable_selectors
         }
 
-        variable_keys = list(value_selector_mapping.keys())
-
         # format answer template
         template_parser = PromptTemplateParser(template=node_data.answer, with_variable_tmpl=True)
         template_variable_keys = template_parser.variable_keys
 
-        # Take the intersection of variable_keys and template_variable_keys
-        variable_keys = list(set(variable_keys) & set(template_variable_keys))
+        # Take the intersection of variable_keys and template_variable_keys,
+        # keep it as a frozenset so the per-part membership checks below are O(1)
+        variable_keys = frozenset(value_selector_mapping.keys()) & frozenset(template_variable_keys)
 
         template = node_data.answer
         for var in variable_keys:
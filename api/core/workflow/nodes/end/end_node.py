@@ -34,7 +34,7 @@ class EndNode(BaseNode):
         )
 
     @classmethod
-    def extract_generate_nodes(cls, graph: dict, config: dict) -> list[str]:
+    def extract_generate_nodes(cls, graph: dict, config: dict) -> set[str]:
         """
         Extract generate nodes
         :param graph: graph
@@ -47,7 +47,7 @@ class EndNode(BaseNode):
         return cls.extract_generate_nodes_from_node_data(graph, node_data)
 
     @classmethod
-    def extract_generate_nodes_from_node_data(cls, graph: dict, node_data: EndNodeData) -> list[str]:
+    def extract_generate_nodes_from_node_data(cls, graph: dict, node_data: EndNodeData) -> set[str]:
         """
         Extract generate nodes from node data
         :param graph: graph
@@ -59,7 +59,8 @@ class EndNode(BaseNode):
 
         variable_selectors = node_data.outputs
 
-        generate_nodes = []
+        # use a set so membership checks in the stream pipeline are O(1) and duplicates are dropped
+        generate_nodes = set()
         for variable_selector in variable_selectors:
             if not variable_selector.value_selector:
                 continue
@@ -69,10 +70,7 @@ class EndNode(BaseNode):
                 node = node_mapping[node_id]
                 node_type = node.get('data', {}).get('type')
                 if node_type == NodeType.LLM.value and variable_selector.value_selector[1] == 'text':
-                    generate_nodes.append(node_id)
-
-        # remove duplicates
-        generate_nodes = list(set(generate_nodes))
+                    generate_nodes.add(node_id)
 
         return generate_nodes
 
@@ -154,13 +154,15 @@ class WorkflowEngineManager:
             workflow=workflow,
             workflow_run_state=workflow_run_state,
             callbacks=callbacks,
+            graph=graph,
         )
 
     def _run_workflow(self, workflow: Workflow,
                      workflow_run_state: WorkflowRunState,
                      callbacks: Sequence[WorkflowCallback],
                      start_at: Optional[str] = None,
-                     end_at: Optional[str] = None) -> None:
+                     end_at: Optional[str] = None,
+                     graph: Optional[Mapping[str, Any]] = None) -> None:
         """
         Run workflow
         :param workflow: Workflow instance
@@ -172,9 +174,17 @@ class WorkflowEngineManager:
         :param call_depth: call depth
         :param start_at: force specific start node
         :param end_at: force specific end node
+        :param graph: parsed workflow graph, avoids re-parsing graph_dict when the caller has it
         :return:
         """
-        graph = workflow.graph_dict
+        if graph is None:
+            graph = workflow.graph_dict
+
+        # build graph indexes once, the per-step node fetches below reuse them
+        node_config_by_id = {node.get('id'): node for node in graph.get('nodes', [])}
+        outgoing_edges_by_source: dict[str, list[dict]] = {}
+        for edge in graph.get('edges', []):
+            outgoing_edges_by_source.setdefault(edge.get('source'), []).append(edge)
 
         try:
             predecessor_node: BaseNode | None = None
@@ -190,7 +200,9 @@ class WorkflowEngineManager:
                     predecessor_node=predecessor_node,
                     callbacks=callbacks,
                     start_at=start_at,
-                    end_at=end_at
+                    end_at=end_at,
+                    node_config_by_id=node_config_by_id,
+                    outgoing_edges_by_source=outgoing_edges_by_source
                 )
 
                 if not next_node:
@@ -230,7 +242,9 @@ class WorkflowEngineManager:
                                 predecessor_node=current_iteration_node,
                                 callbacks=callbacks,
                                 start_at=start_at,
-                                end_at=end_at
+                                end_at=end_at,
+                                node_config_by_id=node_config_by_id,
+                                outgoing_edges_by_source=outgoing_edges_by_source
                             )
                             current_iteration_node = None
                             workflow_run_state.current_iteration_state = None
@@ -239,7 +253,7 @@ class WorkflowEngineManager:
                             # move to next iteration
                             next_node_id = next_iteration
                             # get next id
-                            next_node = self._get_node(workflow_run_state=workflow_run_state, graph=graph, node_id=next_node_id, callbacks=callbacks)
+                            next_node = self._get_node(workflow_run_state=workflow_run_state, graph=graph, node_id=next_node_id, callbacks=callbacks, node_config_by_id=node_config_by_id)
 
                 if not next_node:
                     break
@@ -299,7 +313,7 @@ class WorkflowEngineManager:
                         workflow_run_state.current_iteration_state = None
                         continue
                     else:
-                        next_node = self._get_node(workflow_run_state=workflow_run_state, graph=graph, node_id=next_node_id, callbacks=callbacks)
+                        next_node = self._get_node(workflow_run_state=workflow_run_state, graph=graph, node_id=next_node_id, callbacks=callbacks, node_config_by_id=node_config_by_id)
 
                 # run workflow, run multiple target nodes in the future
                 self._run_workflow_node(
@@ -536,7 +550,8 @@ class WorkflowEngineManager:
             workflow_run_state=workflow_run_state,
             callbacks=callbacks,
             start_at=node_id,
-            end_at=end_node_id
+            end_at=end_node_id,
+            graph=graph
         )
 
     def _workflow_run_success(self, callbacks: Sequence[WorkflowCallback]) -> None:
@@ -653,13 +668,17 @@ class WorkflowEngineManager:
                        predecessor_node: Optional[BaseNode] = None,
                        callbacks: Sequence[WorkflowCallback],
                        start_at: Optional[str] = None,
-                       end_at: Optional[str] = None) -> Optional[BaseNode]:
+                       end_at: Optional[str] = None,
+                       node_config_by_id: Optional[dict[str, dict]] = None,
+                       outgoing_edges_by_source: Optional[dict[str, list[dict]]] = None) -> Optional[BaseNode]:
         """
         Get next node
         multiple target nodes in the future.
         :param graph: workflow graph
         :param predecessor_node: predecessor node
         :param callbacks: workflow callbacks
+        :param node_config_by_id: node id to node config index, built from graph if not provided
+        :param outgoing_edges_by_source: source node id to outgoing edges index, built from graph if not provided
         :return:
         """
         nodes = graph.get('nodes')
@@ -689,11 +708,15 @@ class WorkflowEngineManager:
                     )
 
         else:
-            edges = graph.get('edges')
             source_node_id = predecessor_node.node_id
 
             # fetch all outgoing edges from source node
-            outgoing_edges = [edge for edge in edges if edge.get('source') == source_node_id]
+            if outgoing_edges_by_source is None:
+                edges = graph.get('edges')
+                outgoing_edges = [edge for edge in edges if edge.get('source') == source_node_id]
+            else:
+                outgoing_edges = outgoing_edges_by_source.get(source_node_id, [])
+
             if not outgoing_edges:
                 return None
 
@@ -718,11 +741,10 @@ class WorkflowEngineManager:
                 return None
 
             # fetch target node from target node id
-            target_node_config = None
-            for node in nodes:
-                if node.get('id') == target_node_id:
-                    target_node_config = node
-                    break
+            if node_config_by_id is None:
+                target_node_config = next((node for node in nodes if node.get('id') == target_node_id), None)
+            else:
+                target_node_config = node_config_by_id.get(target_node_id)
 
             if not target_node_config:
                 return None
@@ -745,7 +767,8 @@ class WorkflowEngineManager:
     def _get_node(self, workflow_run_state: WorkflowRunState,
                   graph: Mapping[str, Any],
                   node_id: str,
-                  callbacks: Sequence[WorkflowCallback]):
+                  callbacks: Sequence[WorkflowCallback],
+                  node_config_by_id: Optional[dict[str, dict]] = None):
         """
         Get node from graph by node id
         """
@@ -753,21 +776,25 @@ class WorkflowEngineManager:
         if not nodes:
             return None
 
-        for node_config in nodes:
-            if node_config.get('id') == node_id:
-                node_type = NodeType.value_of(node_config.get('data', {}).get('type'))
-                node_cls = node_classes[node_type]
-                return node_cls(
-                    tenant_id=workflow_run_state.tenant_id,
-                    app_id=workflow_run_state.app_id,
-                    workflow_id=workflow_run_state.workflow_id,
-                    user_id=workflow_run_state.user_id,
-                    user_from=workflow_run_state.user_from,
-                    invoke_from=workflow_run_state.invoke_from,
-                    config=node_config,
-                    callbacks=callbacks,
-                    workflow_call_depth=workflow_run_state.workflow_call_depth
-                )
+        if node_config_by_id is None:
+            node_config = next((node for node in nodes if node.get('id') == node_id), None)
+        else:
+            node_config = node_config_by_id.get(node_id)
+
+        if node_config:
+            node_type = NodeType.value_of(node_config.get('data', {}).get('type'))
+            node_cls = node_classes[node_type]
+            return node_cls(
+                tenant_id=workflow_run_state.tenant_id,
+                app_id=workflow_run_state.app_id,
+                workflow_id=workflow_run_state.workflow_id,
+                user_id=workflow_run_state.user_id,
+                user_from=workflow_run_state.user_from,
+                invoke_from=workflow_run_state.invoke_from,
+                config=node_config,
+                callbacks=callbacks,
+                workflow_call_depth=workflow_run_state.workflow_call_depth
+            )
 
     def _is_timed_out(self, start_at: float, max_execution_time: int) -> bool:
         """
@@ -896,21 +923,19 @@ class WorkflowEngineManager:
         :param variable_value: variable value
         :return:
         """
-        variable_pool.add(
-            [node_id] + variable_key_list, variable_value
-        )
+        # walk nested values with an explicit stack, deeply nested outputs stay within one frame
+        stack = [(variable_key_list, variable_value)]
+        while stack:
+            key_list, value = stack.pop()
 
-        # if variable_value is a dict, then recursively append variables
-        if isinstance(variable_value, dict):
-            for key, value in variable_value.items():
-                # construct new key list
-                new_key_list = variable_key_list + [key]
-                self._append_variables_recursively(
-                    variable_pool=variable_pool,
-                    node_id=node_id,
-                    variable_key_list=new_key_list,
-                    variable_value=value
-                )
+            variable_pool.add(
+                [node_id] + key_list, value
+            )
+
+            # if value is a dict, then append its entries as well
+            if isinstance(value, dict):
+                for key, sub_value in value.items():
+                    stack.append((key_list + [key], sub_value))
 
     @classmethod
     def handle_special_values(cls, value: Optional[dict]) -> Optional[dict]: